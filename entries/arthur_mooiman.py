@@ -12,7 +12,7 @@ def print_measurements(cities: dict) -> None:
     which checks the results and measures runtime performance.
 
     Args:
-        cities (dict): A dictionary where keys are city names (str) and values
+        cities (dict): A dictionary where keys are city names (bytes) and values
                       contain temperature measurement data. The exact structure
                       of the values depends on how measurements are stored
                       (e.g., list of floats, measurement objects, etc.).
@@ -34,10 +34,14 @@ def print_measurements(cities: dict) -> None:
         Amsterdam=8.9/12.3/16.7
         Berlin=-5.8/9.1/23.1
     """
-    cities = dict(sorted(cities.items()))
-    for city, [city_sum, city_cnt, city_min, city_max] in cities.items():
+    # Build one byte buffer and write it in a single call instead of a
+    # print (format + encode + flush check) per city
+    out = bytearray()
+    for city, [city_sum, city_cnt, city_min, city_max] in sorted(cities.items()):
         city_mean = city_sum/city_cnt
-        print(f"{city}={city_min/10:.1f}/{city_mean/10:.1f}/{city_max/10:.1f}")
+        out += city
+        out += f"={city_min/10:.1f}/{city_mean/10:.1f}/{city_max/10:.1f}\n".encode()
+    sys.stdout.buffer.write(out)
 
 
 def main(measurements_file_path: str) -> dict:
@@ -49,19 +53,29 @@ def main(measurements_file_path: str) -> dict:
         dict: Dictionary with station names and temperature measurements/ statistics.
     """
     cities = {}
-    with open(measurements_file_path, "r", encoding="utf-8", buffering=1024 * 1024) as f:
+    # Binary mode skips the UTF-8 decode of every line; one dict lookup
+    # per row, mutating the stats list in place instead of rebuilding it
+    with open(measurements_file_path, "rb", buffering=1024 * 1024) as f:
         for entry in f:
-            city, temp = entry.strip().split(";")
-            temp = int(float(temp) * 10)
-            if not cities.get(city):
-                cities.update({city: [temp, 1, temp, temp]})
+            city, temp = entry.rstrip(b"\n").split(b";", 1)
+            # temp is always -?\d?\d\.\d, so the int10 value comes straight
+            # from the digit bytes instead of int(float(temp) * 10)
+            neg = temp[0] == 45  # ord("-")
+            if len(temp) - neg == 3:
+                value = (temp[neg] - 48) * 10 + (temp[-1] - 48)
             else:
-                city_sum, city_cnt, city_min, city_max = cities.get(city)
-                city_sum += temp
-                city_cnt += 1
-                city_min = temp if temp < city_min else city_min
-                city_max = temp if temp > city_max else city_max
-                cities.update({city: [city_sum, city_cnt, city_min, city_max]})
+                value = (temp[neg] - 48) * 100 + (temp[neg + 1] - 48) * 10 + (temp[-1] - 48)
+            temp = -value if neg else value
+            stats = cities.get(city)
+            if stats is None:
+                cities[city] = [temp, 1, temp, temp]
+            else:
+                stats[0] += temp
+                stats[1] += 1
+                if temp < stats[2]:
+                    stats[2] = temp
+                if temp > stats[3]:
+                    stats[3] = temp
     return cities
 
 if __name__ == '__main__':
@@ -0,0 +1,106 @@
+/* Chunk scanner for sergei_romanov_NOT_RUN_CEXT_v4.py.
+ *
+ * Aggregates one [start, end) range of the measurements buffer into
+ * per-city min/max/sum/count (fixed-point int10 temperatures). Cities
+ * are FNV-1a-hashed into an open-addressing table with linear probing
+ * and a memcmp on collision.
+ *
+ * Separator search runs 32 bytes at a time with AVX2 compare+movemask
+ * when the compiler targets it (-march=native on a capable host) and
+ * falls back to memchr otherwise.
+ *
+ * Compiled at runtime by the entry:  cc -O3 -march=native -shared -fPIC
+ */
+#include <stdint.h>
+#include <string.h>
+
+#ifdef __AVX2__
+#include <immintrin.h>
+#endif
+
+#define TABLE_SIZE 32768 /* power of two, ~0.3 load factor at 10k cities */
+#define MAX_KEY 128      /* 1BRC caps station names at 100 bytes */
+
+static const uint8_t *find_byte(const uint8_t *p, const uint8_t *end, uint8_t c)
+{
+#ifdef __AVX2__
+    const __m256i target = _mm256_set1_epi8((char)c);
+    while (p + 32 <= end) {
+        __m256i v = _mm256_loadu_si256((const __m256i *)p);
+        unsigned mask = (unsigned)_mm256_movemask_epi8(_mm256_cmpeq_epi8(v, target));
+        if (mask)
+            return p + __builtin_ctz(mask);
+        p += 32;
+    }
+#endif
+    return memchr(p, c, (size_t)(end - p));
+}
+
+/* Returns the number of distinct cities; row k's name lives at
+ * key_bytes + k * MAX_KEY with length key_lens[k]. */
+long scan_chunk(const uint8_t *buf, long start, long end,
+                uint8_t *key_bytes, int32_t *key_lens,
+                int64_t *mins, int64_t *maxs, int64_t *sums, int64_t *cnts)
+{
+    static int32_t table[TABLE_SIZE];
+    memset(table, -1, sizeof(table));
+
+    const uint8_t *p = buf + start;
+    const uint8_t *stop = buf + end;
+    long n = 0;
+
+    while (p < stop) {
+        const uint8_t *semi = find_byte(p, stop, ';');
+        if (semi == NULL)
+            break;
+        const uint8_t *city = p;
+        long city_len = semi - p;
+
+        /* temperature is always -?\d?\d\.\d */
+        p = semi + 1;
+        int neg = (*p == '-');
+        p += neg;
+        int64_t value = 0;
+        while (*p != '.') {
+            value = value * 10 + (*p - '0');
+            p++;
+        }
+        value = value * 10 + (p[1] - '0');
+        if (neg)
+            value = -value;
+        p += 3; /* decimal digit + newline */
+
+        uint64_t h = 14695981039346656037ULL;
+        for (long j = 0; j < city_len; j++)
+            h = (h ^ city[j]) * 1099511628211ULL;
+
+        uint64_t slot = h & (TABLE_SIZE - 1);
+        for (;;) {
+            int32_t k = table[slot];
+            if (k == -1) {
+                k = (int32_t)n++;
+                table[slot] = k;
+                memcpy(key_bytes + (long)k * MAX_KEY, city, (size_t)city_len);
+                key_lens[k] = (int32_t)city_len;
+                mins[k] = value;
+                maxs[k] = value;
+                sums[k] = value;
+                cnts[k] = 1;
+                break;
+            }
+            if (key_lens[k] == city_len &&
+                memcmp(key_bytes + (long)k * MAX_KEY, city, (size_t)city_len) == 0) {
+                if (value < mins[k])
+                    mins[k] = value;
+                if (value > maxs[k])
+                    maxs[k] = value;
+                sums[k] += value;
+                cnts[k] += 1;
+                break;
+            }
+            slot = (slot + 1) & (TABLE_SIZE - 1);
+        }
+    }
+
+    return n;
+}
@@ -0,0 +1,197 @@
+#!/usr/bin/python3
+
+# This script uses:
+#  - Multiprocessing for parallelism
+#  - A small C scanner (csrc/scan.c, called via ctypes) that walks each
+#    chunk natively, finding ';'/'\n' 32 bytes at a time with AVX2
+#    compare+movemask where the compiler targets it
+#
+# The C source is compiled on first run (cc -O3 -march=native), so the
+# computation still happens at application runtime, but a C compiler is
+# required - hence NOT_RUN, like the variants needing other runtimes.
+#
+# References:
+# - Italo Nesi https://github.com/ifnesi/1brc
+
+import ctypes
+import mmap
+import os
+import multiprocessing as mp
+import subprocess
+import sys
+
+# Must match scan.c
+MAX_CITIES = 16384
+MAX_KEY = 128
+
+_SRC = os.path.join(os.path.dirname(__file__), "csrc", "scan.c")
+_LIB = os.path.join(os.path.dirname(__file__), "csrc", "_scan.so")
+
+_lib_handle = None
+
+
+def _scan_lib() -> ctypes.CDLL:
+    """Compile scan.c if needed and load it (cached per process)"""
+    global _lib_handle
+    if _lib_handle is not None:
+        return _lib_handle
+
+    if not os.path.exists(_LIB) or os.path.getmtime(_LIB) < os.path.getmtime(_SRC):
+        cc = os.environ.get("CC", "cc")
+        subprocess.run(
+            [cc, "-O3", "-march=native", "-shared", "-fPIC", "-o", _LIB, _SRC],
+            check=True,
+        )
+
+    lib = ctypes.CDLL(_LIB)
+    lib.scan_chunk.restype = ctypes.c_long
+    lib.scan_chunk.argtypes = [
+        ctypes.POINTER(ctypes.c_uint8),
+        ctypes.c_long,
+        ctypes.c_long,
+        ctypes.POINTER(ctypes.c_uint8),
+        ctypes.POINTER(ctypes.c_int32),
+        ctypes.POINTER(ctypes.c_int64),
+        ctypes.POINTER(ctypes.c_int64),
+        ctypes.POINTER(ctypes.c_int64),
+        ctypes.POINTER(ctypes.c_int64),
+    ]
+    _lib_handle = lib
+    return lib
+
+
+def get_file_chunks(
+    file_name: str,
+    max_cpu: int = 8,
+) -> list[int, list[tuple[str, int, int]]]:
+    """Split file into chunks"""
+    cpu_count = min(max_cpu, mp.cpu_count())
+
+    file_size = os.path.getsize(file_name)
+    chunk_size = file_size // cpu_count
+
+    start_end = list()
+    with open(file_name, mode="r+b") as f:
+
+        def is_new_line(position: int) -> bool:
+            if position == 0:
+                return True
+            else:
+                f.seek(position - 1)
+                return f.read(1) == b"\n"
+
+        def next_line(position: int):
+            f.seek(position)
+            f.readline()
+            return f.tell()
+
+        chunk_start = 0
+        while chunk_start < file_size:
+            chunk_end = min(file_size, chunk_start + chunk_size)
+
+            while not is_new_line(chunk_end):
+                chunk_end -= 1
+
+            if chunk_start == chunk_end:
+                chunk_end = next_line(chunk_end)
+
+            start_end.append(
+                (
+                    file_name,
+                    chunk_start,
+                    chunk_end,
+                )
+            )
+
+            chunk_start = chunk_end
+
+    return (
+        cpu_count,
+        start_end,
+    )
+
+
+def _process_file_chunk(
+    file_name: str,
+    chunk_start: int,
+    chunk_end: int,
+) -> dict:
+    """Process each file chunk in a different process"""
+    lib = _scan_lib()
+
+    fd = os.open(file_name, os.O_RDONLY)
+    # ACCESS_COPY so ctypes.from_buffer gets the writable buffer it
+    # insists on; pages stay shared until someone actually writes
+    mm = mmap.mmap(fd, 0, access=mmap.ACCESS_COPY)
+    os.close(fd)
+    buf = (ctypes.c_uint8 * len(mm)).from_buffer(mm)
+
+    key_bytes = (ctypes.c_uint8 * (MAX_CITIES * MAX_KEY))()
+    key_lens = (ctypes.c_int32 * MAX_CITIES)()
+    mins = (ctypes.c_int64 * MAX_CITIES)()
+    maxs = (ctypes.c_int64 * MAX_CITIES)()
+    sums = (ctypes.c_int64 * MAX_CITIES)()
+    cnts = (ctypes.c_int64 * MAX_CITIES)()
+
+    n = lib.scan_chunk(
+        buf, chunk_start, chunk_end, key_bytes, key_lens, mins, maxs, sums, cnts
+    )
+
+    result = dict()
+    raw = bytes(key_bytes)
+    for k in range(n):
+        location = raw[k * MAX_KEY : k * MAX_KEY + key_lens[k]]
+        result[location] = [
+            mins[k],
+            maxs[k],
+            sums[k],
+            cnts[k],
+        ]  # min, max, sum, count
+
+    # mm is closed on dealloc once buf (exported from it) goes away;
+    # closing it explicitly here raises BufferError while buf is alive
+    return result
+
+
+def process_file(
+    cpu_count: int,
+    start_end: list,
+    file: str
+) -> dict:
+    """Process data file"""
+
+    # Compile once in the parent so the pool workers just dlopen
+    _scan_lib()
+
+    with mp.Pool(cpu_count) as p:
+        # Run chunks in parallel
+        chunk_results = p.starmap(
+            _process_file_chunk,
+            start_end,
+        )
+
+    # Combine all results from all chunks
+    result = dict()
+    for chunk_result in chunk_results:
+        for location, measurements in chunk_result.items():
+            if location not in result:
+                result[location] = measurements
+            else:
+                _result = result[location]
+                if measurements[0] < _result[0]:
+                    _result[0] = measurements[0]
+                if measurements[1] > _result[1]:
+                    _result[1] = measurements[1]
+                _result[2] += measurements[2]
+                _result[3] += measurements[3]
+
+    # Print final results
+    for location, measurements in sorted(result.items()):
+        print(
+            f"{location.decode('utf-8')}={measurements[0]/10:.1f}/{(measurements[2] / measurements[3] /10) if measurements[3] !=0 else 0:.1f}/{measurements[1] /10:.1f}",
+            end="\n",
+        )
+
+if __name__ == "__main__":
+    cpu_count, *start_end = get_file_chunks(sys.argv[1])
+    process_file(cpu_count, start_end[0], sys.argv[1])
@@ -0,0 +1,226 @@
+#!/usr/bin/python3
+
+# This script uses:
+#  - Multiprocessing for parallelism
+#  - Numba-compiled inner loop over a uint8 view of the mmap
+#  - FNV-1a open-addressing hash table over parallel int64 arrays (SoA)
+#  - Vectorized NumPy merge of per-chunk results in the parent
+#
+# Needs numba + numpy installed, so it breaks the "standard library only"
+# rule and is not part of the regular leaderboard run (same spirit as the
+# NOT_RUN_PYPY variants that need a different interpreter).
+#
+# References:
+# - Italo Nesi https://github.com/ifnesi/1brc
+
+import mmap
+import os
+import multiprocessing as mp
+import sys
+
+import numpy as np
+from numba import njit
+
+# 1BRC guarantees at most 10_000 unique stations
+MAX_CITIES = 16384
+# Open-addressing table size; power of two, ~0.3 load factor at 10k keys
+TABLE_SIZE = 32768
+
+
+@njit(cache=True)
+def _scan(buf, start, end, key_starts, key_ends, mins, maxs, sums, cnts, table):
+    """Aggregate one chunk of the uint8 buffer into parallel arrays.
+
+    Cities are FNV-1a-hashed into an open-addressing table (linear
+    probing, stored key spans compared on collision). Returns the number
+    of distinct cities seen; their name byte spans are recorded in
+    key_starts/key_ends so the caller can slice them out.
+    """
+    fnv_prime = np.uint64(1099511628211)
+    mask = np.uint64(TABLE_SIZE - 1)
+    one = np.uint64(1)
+    n = 0
+
+    i = start
+    while i < end:
+        city_start = i
+        h = np.uint64(14695981039346656037)
+        while buf[i] != 59:  # ord(";")
+            h = (h ^ np.uint64(buf[i])) * fnv_prime
+            i += 1
+        city_end = i
+        i += 1
+
+        # Temperature is always -?\d?\d\.\d
+        neg = buf[i] == 45  # ord("-")
+        if neg:
+            i += 1
+        value = 0
+        while buf[i] != 46:  # ord(".")
+            value = value * 10 + (buf[i] - 48)
+            i += 1
+        value = value * 10 + (buf[i + 1] - 48)
+        if neg:
+            value = -value
+        i += 3  # decimal digit + newline
+
+        slot = h & mask
+        while True:
+            k = table[slot]
+            if k == -1:
+                # first occurrence: claim the slot and the next row
+                k = n
+                n += 1
+                table[slot] = k
+                key_starts[k] = city_start
+                key_ends[k] = city_end
+                mins[k] = value
+                maxs[k] = value
+                sums[k] = value
+                cnts[k] = 1
+                break
+            ks = key_starts[k]
+            if key_ends[k] - ks == city_end - city_start:
+                match = True
+                for j in range(city_end - city_start):
+                    if buf[ks + j] != buf[city_start + j]:
+                        match = False
+                        break
+                if match:
+                    if value < mins[k]:
+                        mins[k] = value
+                    if value > maxs[k]:
+                        maxs[k] = value
+                    sums[k] += value
+                    cnts[k] += 1
+                    break
+            slot = (slot + one) & mask
+
+    return n
+
+
+def get_file_chunks(
+    file_name: str,
+    max_cpu: int = 8,
+) -> list[int, list[tuple[str, int, int]]]:
+    """Split file into chunks"""
+    cpu_count = min(max_cpu, mp.cpu_count())
+
+    file_size = os.path.getsize(file_name)
+    chunk_size = file_size // cpu_count
+
+    start_end = list()
+    with open(file_name, mode="r+b") as f:
+
+        def is_new_line(position: int) -> bool:
+            if position == 0:
+                return True
+            else:
+                f.seek(position - 1)
+                return f.read(1) == b"\n"
+
+        def next_line(position: int):
+            f.seek(position)
+            f.readline()
+            return f.tell()
+
+        chunk_start = 0
+        while chunk_start < file_size:
+            chunk_end = min(file_size, chunk_start + chunk_size)
+
+            while not is_new_line(chunk_end):
+                chunk_end -= 1
+
+            if chunk_start == chunk_end:
+                chunk_end = next_line(chunk_end)
+
+            start_end.append(
+                (
+                    file_name,
+                    chunk_start,
+                    chunk_end,
+                )
+            )
+
+            chunk_start = chunk_end
+
+    return (
+        cpu_count,
+        start_end,
+    )
+
+
+def _process_file_chunk(
+    file_name: str,
+    chunk_start: int,
+    chunk_end: int,
+) -> dict:
+    """Process each file chunk in a different process"""
+    fd = os.open(file_name, os.O_RDONLY)
+    mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    os.close(fd)
+    if hasattr(mm, "madvise"):  # Unix only
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+
+    buf = np.frombuffer(mm, dtype=np.uint8)
+    key_starts = np.zeros(MAX_CITIES, np.int64)
+    key_ends = np.zeros(MAX_CITIES, np.int64)
+    mins = np.zeros(MAX_CITIES, np.int64)
+    maxs = np.zeros(MAX_CITIES, np.int64)
+    sums = np.zeros(MAX_CITIES, np.int64)
+    cnts = np.zeros(MAX_CITIES, np.int64)
+    table = np.full(TABLE_SIZE, -1, np.int64)
+
+    n = _scan(buf, chunk_start, chunk_end, key_starts, key_ends, mins, maxs, sums, cnts, table)
+
+    keys = [mm[key_starts[k]:key_ends[k]] for k in range(n)]
+
+    # mm is closed on dealloc once buf (whose base it is) goes away;
+    # closing it explicitly here raises BufferError while buf is alive
+    return keys, mins[:n], maxs[:n], sums[:n], cnts[:n]
+
+
+def process_file(
+    cpu_count: int,
+    start_end: list,
+    file: str
+) -> dict:
+    """Process data file"""
+
+    with mp.Pool(cpu_count) as p:
+        # Run chunks in parallel
+        chunk_results = p.starmap(
+            _process_file_chunk,
+            start_end,
+        )
+
+    # Combine all results from all chunks; keys are unique within each
+    # chunk result, so the merge is four vectorized ops per chunk
+    result_idx = dict()
+    m_mins = np.full(MAX_CITIES, 2**31, np.int64)
+    m_maxs = np.full(MAX_CITIES, -(2**31), np.int64)
+    m_sums = np.zeros(MAX_CITIES, np.int64)
+    m_cnts = np.zeros(MAX_CITIES, np.int64)
+    for keys, mins, maxs, sums, cnts in chunk_results:
+        rows = np.empty(len(keys), np.int64)
+        for j, location in enumerate(keys):
+            k = result_idx.get(location)
+            if k is None:
+                k = len(result_idx)
+                result_idx[location] = k
+            rows[j] = k
+        m_mins[rows] = np.minimum(m_mins[rows], mins)
+        m_maxs[rows] = np.maximum(m_maxs[rows], maxs)
+        m_sums[rows] += sums
+        m_cnts[rows] += cnts
+
+    # Print final results
+    for location, k in sorted(result_idx.items()):
+        print(
+            f"{location.decode('utf-8')}={m_mins[k]/10:.1f}/{(m_sums[k] / m_cnts[k] /10) if m_cnts[k] !=0 else 0:.1f}/{m_maxs[k] /10:.1f}",
+            end="\n",
+        )
+
+if __name__ == "__main__":
+    cpu_count, *start_end = get_file_chunks(sys.argv[1])
+    process_file(cpu_count, start_end[0], sys.argv[1])
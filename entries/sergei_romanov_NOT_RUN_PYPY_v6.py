@@ -106,56 +106,54 @@ def _process_file_chunk(
     """Process each file chunk in a different process"""
     result = dict()
 
-    with open(file_name, mode="r+b") as fh:
-        fh.seek(chunk_start)
-        gc_disable()
+    # Positional reads: no per-worker seek, no file-offset mutation, and
+    # fadvise tells the kernel to prefetch this worker's range only
+    fd = os.open(file_name, os.O_RDONLY)
+    if hasattr(os, "posix_fadvise"):  # Unix only
+        os.posix_fadvise(
+            fd, chunk_start, chunk_end - chunk_start, os.POSIX_FADV_SEQUENTIAL
+        )
+    gc_disable()
 
-        tail = b""
-        location = None
-        byte_count = chunk_end - chunk_start
-    
-        while byte_count > 0:
-            if blocksize > byte_count:
-                blocksize = byte_count
-            byte_count -= blocksize
-
-            index = 0
-            data = tail + fh.read(blocksize)
-            while data:
-                if location is None:
-                    try:
-                        semicolon_indx: int = data.index(b";", index)
-                    except ValueError:
-                        tail = data[index:]
-                        break
-
-                    location = data[index:semicolon_indx]
-                    index = semicolon_indx + 1
-
-                try:
-                    newline = data.index(b"\n", index)
-                except ValueError:
-                    tail = data[index:]
-                    break
-
-                temperature = int(float(data[index:newline]) * 10)
-                index = newline + 1
-                
-                try:
-                    stats = result[location]
-                    if temperature < stats[0]:
-                        stats[0] = temperature
-                    if temperature > stats[1]:
-                        stats[1] = temperature
-                    stats[2] +=temperature 
-                    stats[3] += 1
-                except KeyError:
-                    # array('d', [min, max, sum, count, compensation])
-                    result[location] = [temperature, temperature, temperature, 1]
-                    # result[location] = array('i', [temperature, temperature, temperature, 1])
-
-                location = None
-        gc_enable()
+    # Local aliases: LOAD_FAST + a C-level min/max call instead of two
+    # data-dependent branches per row
+    _mn = min
+    _mx = max
+
+    tail = b""
+    offset = chunk_start
+    byte_count = chunk_end - chunk_start
+
+    while byte_count > 0:
+        if blocksize > byte_count:
+            blocksize = byte_count
+        byte_count -= blocksize
+
+        data = tail + os.pread(fd, blocksize, offset)
+        offset += blocksize
+
+        # One C pass splits the whole block into lines instead of two
+        # bytes.index calls (with their setup cost) per row
+        lines = data.split(b"\n")
+        tail = lines.pop()
+
+        for line in lines:
+            semicolon_indx = line.find(b";")
+            location = line[:semicolon_indx]
+            temperature = int(float(line[semicolon_indx + 1:]) * 10)
+
+            try:
+                stats = result[location]
+                stats[0] = _mn(stats[0], temperature)
+                stats[1] = _mx(stats[1], temperature)
+                stats[2] +=temperature
+                stats[3] += 1
+            except KeyError:
+                # array('d', [min, max, sum, count, compensation])
+                result[location] = [temperature, temperature, temperature, 1]
+                # result[location] = array('i', [temperature, temperature, temperature, 1])
+    gc_enable()
+    os.close(fd)
     return result
 
 
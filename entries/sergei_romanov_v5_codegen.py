@@ -0,0 +1,294 @@
+#!/usr/bin/python3
+
+# This script uses:
+#  - Multiprocessing for parallelism (fork + per-worker mmap initializer)
+#  - A specialized scanner generated at runtime: after sampling the head
+#    of the file for the city set, it exec-compiles the whole per-chunk
+#    scan loop with the city dispatch inlined as a byte-offset
+#    discrimination tree (branch on the first position where the
+#    remaining candidates differ, one slice compare at the leaf). Known
+#    cities cost no hashing and no per-row function call; cities that
+#    never appeared in the sample fall back to a dict. Codegen+compile
+#    is a one-off (~0.5s at the 10k-station cap) paid by the parent and
+#    amortized over the full-size run.
+#
+# References:
+# - Italo Nesi https://github.com/ifnesi/1brc
+
+import marshal
+import mmap
+import os
+import multiprocessing as mp
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from gc import disable as gc_disable, enable as gc_enable
+import sys
+
+# GC stays off for the whole run; the parent re-enables it just before
+# the final sort/print
+gc_disable()
+
+
+def _sample_cities(file_name: str, sample_size: int = 1 << 20) -> list[bytes]:
+    """First pass: learn the city set from the head of the file"""
+    cities = dict()
+    with open(file_name, "rb") as f:
+        lines = f.read(sample_size).split(b"\n")
+    lines.pop()  # partial tail
+    for line in lines:
+        semicolon_indx = line.find(b";")
+        if semicolon_indx > 0:
+            cities.setdefault(line[:semicolon_indx], None)
+    return list(cities)
+
+
+def _build_scan_source(cities: list[bytes]) -> str:
+    """Generate the per-chunk scan loop with the city dispatch inlined.
+
+    The dispatch is a byte-offset discrimination tree: after branching
+    on the span length, each node branches on the first position where
+    the remaining candidates still differ (so shared prefixes are
+    skipped in one hop), until a single candidate is left and one slice
+    compare settles it. A known city costs a few byte compares plus one
+    memcmp, bounded by the name length - never a walk over the candidate
+    list - and its stats update runs inline, with no per-row call. A
+    miss anywhere falls through to the dict path for unsampled cities.
+    """
+    lines = [
+        "def scan(data, view, start, end, slots, extra):",
+        "    _mn = min",
+        "    _mx = max",
+        "    index = start",
+        "    while index < end:",
+        '        semicolon_indx = data.find(b";", index, end)',
+        "        if semicolon_indx == -1:",
+        "            break",
+        "        city_start = index",
+        "        index = semicolon_indx + 1",
+        '        newline = data.find(b"\\n", index, end)',
+        "        if newline == -1:",
+        "            break",
+        r"        # Temperature is always -?\d?\d\.\d",
+        "        s = index",
+        '        if data[s] == 45:  # ord("-")',
+        "            s += 1",
+        "            if newline - s == 3:",
+        "                value = -((data[s] - 48) * 10 + (data[s + 2] - 48))",
+        "            else:",
+        "                value = -((data[s] - 48) * 100 + (data[s + 1] - 48) * 10 + (data[s + 3] - 48))",
+        "        else:",
+        "            if newline - s == 3:",
+        "                value = (data[s] - 48) * 10 + (data[s + 2] - 48)",
+        "            else:",
+        "                value = (data[s] - 48) * 100 + (data[s + 1] - 48) * 10 + (data[s + 3] - 48)",
+        "        index = newline + 1",
+        "        n = semicolon_indx - city_start",
+        "        stats = None",
+    ]
+
+    def emit(group: list, pad: str) -> None:
+        if len(group) == 1:
+            # leaves only bind the stats row; the shared block after the
+            # tree updates it, which keeps the generated source (and its
+            # one-off compile time) roughly half the size
+            city, idx = group[0]
+            lines.append(f"{pad}if view[city_start:semicolon_indx] == {city!r}:")
+            lines.append(f"{pad}    stats = slots[{idx}]")
+            return
+        # first byte position where the candidates still differ
+        k = 0
+        while len({city[k] for city, _ in group}) == 1:
+            k += 1
+        branches = {}
+        for city, idx in group:
+            branches.setdefault(city[k], []).append((city, idx))
+        lines.append(f"{pad}b = data[city_start + {k}]")
+        keyword = "if"
+        for byte_value in sorted(branches):
+            lines.append(f"{pad}{keyword} b == {byte_value}:")
+            emit(branches[byte_value], pad + "    ")
+            keyword = "elif"
+
+    by_len = {}
+    for idx, city in enumerate(cities):
+        by_len.setdefault(len(city), []).append((city, idx))
+    keyword = "if"
+    for length in sorted(by_len):
+        lines.append(f"        {keyword} n == {length}:")
+        emit(by_len[length], "            ")
+        keyword = "elif"
+
+    lines += [
+        "        if stats is not None:",
+        "            stats[0] = _mn(stats[0], value)",
+        "            stats[1] = _mx(stats[1], value)",
+        "            stats[2] += value",
+        "            stats[3] += 1",
+        "            continue",
+        "        # a miss above means the sample never saw this city",
+        "        location = data[city_start:semicolon_indx]",
+        "        j = extra.get(location)",
+        "        if j is None:",
+        "            extra[location] = len(slots)",
+        "            slots.append([value, value, value, 1])",
+        "        else:",
+        "            stats = slots[j]",
+        "            stats[0] = _mn(stats[0], value)",
+        "            stats[1] = _mx(stats[1], value)",
+        "            stats[2] += value",
+        "            stats[3] += 1",
+    ]
+    return "\n".join(lines)
+
+
+def get_file_chunks(
+    file_name: str,
+    max_cpu: int = 8,
+) -> list[int, list[tuple[int, int]]]:
+    """Split file into chunks"""
+    cpu_count = min(max_cpu, mp.cpu_count())
+
+    file_size = os.path.getsize(file_name)
+    # Many more chunks than workers so fast workers can steal the
+    # remainder instead of idling behind a straggler
+    chunk_size = file_size // (cpu_count * 8)
+
+    start_end = list()
+    with open(file_name, mode="r+b") as f:
+
+        def is_new_line(position: int) -> bool:
+            if position == 0:
+                return True
+            else:
+                f.seek(position - 1)
+                return f.read(1) == b"\n"
+
+        def next_line(position: int):
+            f.seek(position)
+            f.readline()
+            return f.tell()
+
+        chunk_start = 0
+        while chunk_start < file_size:
+            chunk_end = min(file_size, chunk_start + chunk_size)
+
+            while not is_new_line(chunk_end):
+                chunk_end -= 1
+
+            if chunk_start == chunk_end:
+                chunk_end = next_line(chunk_end)
+
+            start_end.append(
+                (
+                    chunk_start,
+                    chunk_end,
+                )
+            )
+
+            chunk_start = chunk_end
+
+    return (
+        cpu_count,
+        start_end,
+    )
+
+
+# Per-worker state, set up once by _init_worker
+MM = None
+SCAN = None
+KNOWN = 0
+
+
+def _init_worker(file_name: str, scan_code: bytes, known: int) -> None:
+    """Pool initializer: mmap the file and load the generated scanner"""
+    global MM, SCAN, KNOWN
+    fd = os.open(file_name, os.O_RDONLY)
+    MM = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    os.close(fd)
+    if hasattr(MM, "madvise"):  # Unix only
+        MM.madvise(mmap.MADV_SEQUENTIAL)
+
+    # The parent compiled the generated source once; workers only
+    # unmarshal the code object instead of recompiling ~35k lines each
+    namespace = dict()
+    exec(marshal.loads(scan_code), namespace)
+    SCAN = namespace["scan"]
+    KNOWN = known
+
+
+def _process_file_chunk(
+    start_end: tuple[int, int],
+) -> tuple[list[bytes], array]:
+    """Process one (chunk_start, chunk_end) range against the worker's mmap"""
+    chunk_start, chunk_end = start_end
+    data = MM
+
+    # Rows 0..KNOWN-1 are the sampled cities (ids fixed inside the
+    # generated scanner); cities the sample missed are appended by its
+    # fallback path and come back keyed through extra_ids
+    slots = [[2**31, -(2**31), 0, 0] for _ in range(KNOWN)]
+    extra_ids = dict()
+
+    SCAN(data, memoryview(data), chunk_start, chunk_end, slots, extra_ids)
+
+    keys = list(extra_ids)
+    flat = array("q")
+    for stats in slots:
+        flat.extend(stats)
+    return keys, flat
+
+
+def process_file(
+    cpu_count: int,
+    start_end: list,
+    file: str
+) -> dict:
+    """Process data file"""
+
+    # First pass over the head of the file: learn the city set,
+    # generate the specialized scanner and compile it once here
+    sampled = _sample_cities(file)
+    scan_code = marshal.dumps(
+        compile(_build_scan_source(sampled), "<scan>", "exec")
+    )
+
+    result = dict()
+    with ProcessPoolExecutor(
+        max_workers=cpu_count,
+        initializer=_init_worker,
+        initargs=(file, scan_code, len(sampled)),
+    ) as ex:
+        futures = [ex.submit(_process_file_chunk, se) for se in start_end]
+        for future in as_completed(futures):
+            extra_keys, flat = future.result()
+            chunk_keys = sampled + extra_keys
+            for i, location in enumerate(chunk_keys):
+                base = 4 * i
+                if flat[base + 3] == 0:
+                    # sampled city that never appeared in this chunk
+                    continue
+                _result = result.get(location)
+                if _result is None:
+                    result[location] = flat[base:base + 4]
+                else:
+                    if flat[base] < _result[0]:
+                        _result[0] = flat[base]
+                    if flat[base + 1] > _result[1]:
+                        _result[1] = flat[base + 1]
+                    _result[2] += flat[base + 2]
+                    _result[3] += flat[base + 3]
+
+    # Print final results in one buffered write instead of a print per city
+    gc_enable()
+    out = bytearray()
+    for location, measurements in sorted(result.items()):
+        out += location
+        out += (
+            f"={measurements[0]/10:.1f}/{(measurements[2] / measurements[3] /10) if measurements[3] !=0 else 0:.1f}/{measurements[1] /10:.1f}\n"
+        ).encode()
+    sys.stdout.buffer.write(out)
+
+if __name__ == "__main__":
+    mp.set_start_method("fork", force=True)
+    cpu_count, *start_end = get_file_chunks(sys.argv[1])
+    process_file(cpu_count, start_end[0], sys.argv[1])
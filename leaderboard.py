@@ -1,4 +1,5 @@
 import itertools as it
+import os
 import pathlib
 import subprocess
 from collections import defaultdict
@@ -70,7 +71,7 @@ def make_ground_truth(txt_file):
 
     return result
 
-def main(measurement_file, entries, ground_truth, python_executable="python") -> dict[pathlib.Path, list[float]]:
+def main(measurement_file, entries, ground_truth, python_executable="python", env=None) -> dict[pathlib.Path, list[float]]:
     def compare(ground_truth, result: list[str]):
         if len(ground_truth) != len(result):
             yield f"Length mismatch: expected {len(ground_truth)} lines, got {len(result)} lines"
@@ -92,6 +93,7 @@ def main(measurement_file, entries, ground_truth, python_executable="python") ->
                     encoding="utf-8",
                     capture_output=True,
                     text=True,
+                    env=env,
                 )
                 toc = timer()
                 res.check_returncode()
@@ -123,16 +125,31 @@ def print_leaderboard(times: dict[pathlib.Path, list[float]]):
         idx += 1
 
 if __name__ == "__main__":
-    measurement_file, entries = get_entries(sys.argv)
+    sys_args = sys.argv[:]
+    use_pypy = "--pypy" in sys_args
+    if use_pypy:
+        sys_args.remove("--pypy")
+
+    measurement_file, entries = get_entries(sys_args)
 
     python_executable = "python3.12"
-    if WITH_VERIFICATION:
+    env = None
+    if use_pypy:
+        print("Using pypy (--pypy), skipping the interpreter prompt")
+        python_executable = "python3.10" # assuming pypy is installed as python3.10
+    elif WITH_VERIFICATION:
         choice = input("\n1 for cpython (default), 2 for pypy: ").strip()
         if choice == "2":
             print("Using pypy for verification runs")
             python_executable = "python3.10" # assuming pypy is installed as python3.10
+            use_pypy = True
+
+    if use_pypy:
+        # Bigger nursery keeps the pool workers' allocation bursts out of
+        # pypy's minor collections
+        env = os.environ | {"PYPY_GC_NURSERY": "256M"}
 
     ground_truth = make_ground_truth(measurement_file)
 
-    entry_runtimes = main(measurement_file, entries, ground_truth, python_executable)
+    entry_runtimes = main(measurement_file, entries, ground_truth, python_executable, env)
     print_leaderboard(entry_runtimes)